@@ -1,20 +1,24 @@
 import os
-import psycopg2
-from fastapi import FastAPI, HTTPException
+import anyio
+import orjson
+import redis
+from datetime import datetime, time, timedelta
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
-from dotenv import load_dotenv
 from typing import List, Optional
 from fastapi.middleware.cors import CORSMiddleware
 
+from db import MAX_CONNECTIONS, DatabaseUnavailable, close_pool, db, execute_prepared, prepare_statement
 
+REDIS_URL = os.getenv("REDIS_URL")
+REDIS_TIMEOUT = 0.25  # Seconds to wait on Redis before serving from the database instead
+CACHE_TTL = 300  # Seconds a cached read response stays valid
+CACHE_PREFIXES = ("prog", "hist", "insights", "proj", "reminders")
+PAGE_SIZE = 100  # Default number of rows per page for history-sized responses
 
-
-# ✅ Load environment variables
-load_dotenv()
-DATABASE_URL = os.getenv("DATABASE_URL")
-
-# ✅ Initialize FastAPI app
-app = FastAPI()
+# ✅ Initialize FastAPI app (orjson serializes responses, including dates, natively)
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # ✅ Enable CORS for React & Flutter UI
 app.add_middleware(
@@ -25,332 +29,360 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ✅ Database connection function
-def get_db_connection():
-    try:
-        return psycopg2.connect(DATABASE_URL)
-    except Exception as e:
-        print(f"❌ Database Connection Error: {e}")
-        return None
+# ✅ No free or reachable database connection: tell the client to retry instead of returning null
+@app.exception_handler(DatabaseUnavailable)
+async def database_unavailable(request, exc):
+    return ORJSONResponse(status_code=503, content={"detail": "Database unavailable, try again shortly."})
+
+# ✅ Hot queries, PREPAREd once per pooled connection
+
+# Builds suggestions from the latest routine, inserts the ones without a pending
+# adjustment (habit_adj_pending_unique) and returns what was inserted, in one round trip
+prepare_statement("adjust_habits", """
+    WITH routine AS (
+        SELECT user_id, wake_up_time, sleep_time, meal_times, bad_habits
+        FROM daily_routines
+        WHERE user_id = %s
+        ORDER BY date DESC, routine_id DESC
+        LIMIT 1
+    ),
+    suggested AS (
+        SELECT
+            to_char(greatest(6, extract(hour FROM wake_up_time)::int - 1), 'FM00') || ':' ||
+                to_char(extract(minute FROM wake_up_time)::int, 'FM00') AS wake_up_time,
+            to_char(greatest(22, extract(hour FROM sleep_time)::int - 1), 'FM00') || ':' ||
+                to_char(extract(minute FROM sleep_time)::int, 'FM00') AS sleep_time,
+            ARRAY(
+                SELECT to_char(greatest(6, extract(hour FROM m)::int - 1), 'FM00') || ':' ||
+                    to_char(extract(minute FROM m)::int, 'FM00')
+                FROM unnest(meal_times) WITH ORDINALITY AS u(m, i)
+                ORDER BY i
+            ) AS meal_times,
+            bad_habits[1:cardinality(bad_habits) - 1] AS bad_habits  -- Remove only one bad habit
+        FROM routine
+    ),
+    candidates AS (
+        SELECT r.user_id, v.*
+        FROM routine r
+        CROSS JOIN suggested s
+        CROSS JOIN LATERAL (VALUES
+            -- 🔹 Wake-Up Time Adjustment
+            (1, 'wake_up_time', r.wake_up_time::text, s.wake_up_time, to_json(s.wake_up_time),
+                'Gradual wake-up shift', extract(hour FROM r.sleep_time) > 1),
+            -- 🔹 Sleep Time Adjustment
+            (2, 'sleep_time', r.sleep_time::text, s.sleep_time, to_json(s.sleep_time),
+                'Improve sleep quality', extract(hour FROM r.sleep_time) > 1),
+            -- 🔹 Meal Timing Adjustment
+            (3, 'meal_times', array_to_json(r.meal_times)::text, array_to_json(s.meal_times)::text, array_to_json(s.meal_times),
+                'Optimize meal timing', cardinality(r.meal_times) > 0),
+            -- 🔹 Bad Habits Reduction (Remove one at a time)
+            (4, 'bad_habits', array_to_json(r.bad_habits)::text, array_to_json(s.bad_habits)::text, array_to_json(s.bad_habits),
+                'Reduce negative habits', cardinality(r.bad_habits) > 0)
+        ) AS v(position, habit, current_value, next_suggested_value, suggested_change, reason, applies)
+        WHERE v.applies
+    ),
+    inserted AS (
+        INSERT INTO habit_adjustments (user_id, applied_on, current_value, next_suggested_value, reason, status, habit)
+        SELECT user_id, CURRENT_DATE, current_value, next_suggested_value, reason, 'pending', habit
+        FROM candidates
+        ON CONFLICT (user_id, habit) WHERE status = 'pending' DO NOTHING
+        RETURNING habit
+    )
+    SELECT
+        EXISTS (SELECT 1 FROM routine) AS has_routine,
+        (
+            SELECT json_agg(json_build_object('habit', c.habit, 'suggested_change', c.suggested_change) ORDER BY c.position)
+            FROM candidates c
+            JOIN inserted USING (habit)
+        ) AS adjustments
+""")
+
+# Moves an adjustment into habit_history with the user's decision, atomically and in one round trip
+prepare_statement("move_adjustment_to_history", """
+    WITH moved AS (
+        DELETE FROM habit_adjustments
+        WHERE adjustment_id = %s
+        RETURNING user_id, habit, current_value, next_suggested_value
+    )
+    INSERT INTO habit_history (user_id, habit, previous_value, new_value, status)
+    SELECT user_id, habit, current_value, next_suggested_value, %s
+    FROM moved
+    RETURNING user_id
+""")
+
+# Adjustments bucketed by status into the JSON arrays habit_progress returns, one page at a time
+prepare_statement("fetch_progress", """
+    SELECT
+        count(*) AS total,
+        COALESCE(json_agg(entry ORDER BY applied_on, adjustment_id) FILTER (WHERE status = 'accepted'), '[]') AS accepted,
+        COALESCE(json_agg(entry ORDER BY applied_on, adjustment_id) FILTER (WHERE status = 'pending'), '[]') AS pending,
+        COALESCE(json_agg(entry ORDER BY applied_on, adjustment_id) FILTER (WHERE status IS NULL OR status NOT IN ('accepted', 'pending')), '[]') AS rejected
+    FROM (
+        SELECT status, applied_on, adjustment_id,
+               json_build_object('habit', habit, 'previous_value', current_value, 'new_value', next_suggested_value, 'date', applied_on) AS entry
+        FROM habit_adjustments
+        WHERE user_id = %s
+        ORDER BY applied_on, adjustment_id  -- Unique tiebreaker keeps page boundaries stable
+        LIMIT %s OFFSET %s
+    ) AS adjustments
+""")
+
+# History bucketed into the accepted/rejected JSON arrays habit_history returns, one page at a time
+prepare_statement("fetch_history_buckets", """
+    SELECT
+        count(*) AS total,
+        COALESCE(json_agg(entry ORDER BY date_applied DESC, history_id DESC) FILTER (WHERE status = 'accepted'), '[]') AS accepted,
+        COALESCE(json_agg(entry ORDER BY date_applied DESC, history_id DESC) FILTER (WHERE status IS DISTINCT FROM 'accepted'), '[]') AS rejected
+    FROM (
+        SELECT status, date_applied, history_id,
+               json_build_object('habit', habit, 'previous_value', previous_value, 'new_value', new_value, 'date', date_applied) AS entry
+        FROM habit_history
+        WHERE user_id = %s
+        ORDER BY date_applied DESC, history_id DESC  -- Unique tiebreaker keeps page boundaries stable
+        LIMIT %s OFFSET %s
+    ) AS history
+""")
+
+# Chat insight sentences, formatted server-side (%% escapes format()'s %s placeholders)
+prepare_statement("fetch_insights", """
+    SELECT CASE status
+        WHEN 'accepted' THEN format('✅ You successfully changed %%s from ''%%s'' to ''%%s'' on %%s. Keep it up!',
+                                    habit, previous_value, new_value, date_applied)
+        ELSE format('❌ You decided not to change %%s from ''%%s'' to ''%%s'' on %%s. That’s okay! Adjust at your own pace.',
+                    habit, previous_value, new_value, date_applied)
+    END AS insight
+    FROM habit_history
+    WHERE user_id = %s AND status IN ('accepted', 'rejected')
+    ORDER BY date_applied DESC, history_id DESC
+    LIMIT %s OFFSET %s
+""")
+
+prepare_statement("fetch_todays_reminders", """
+    SELECT habit, reminder_message, date_applied
+    FROM habit_history
+    WHERE user_id = %s AND status = 'accepted' AND date_applied = CURRENT_DATE
+""")
+
+# First and latest accepted value per habit, in order of each habit's first change
+prepare_statement("fetch_projections", """
+    SELECT habit,
+           (array_agg(previous_value ORDER BY date_applied ASC, history_id ASC))[1] AS start_value,
+           (array_agg(new_value ORDER BY date_applied DESC, history_id DESC))[1] AS current_value
+    FROM habit_history
+    WHERE user_id = %s AND status = 'accepted'
+    GROUP BY habit
+    ORDER BY min(date_applied), habit
+""")
+
+# ✅ Redis response cache for the read endpoints (disabled when REDIS_URL is unset).
+#    Each user's responses live in one hash per endpoint, one field per page, so
+#    invalidation can drop every page with a single DEL. The hash's TTL is set only
+#    when it is created (EXPIRE NX, Redis 7+), so writing more pages never extends
+#    it: a read that races a write and stores its pre-write response just after
+#    the DEL is served for at most CACHE_TTL.
+@app.on_event("startup")
+def connect_cache():
+    app.state.redis = redis.Redis.from_url(
+        REDIS_URL, socket_connect_timeout=REDIS_TIMEOUT, socket_timeout=REDIS_TIMEOUT
+    ) if REDIS_URL else None
+
+def get_cached(key, field=""):
+    if app.state.redis:
+        try:
+            cached = app.state.redis.hget(key, field)
+        except redis.RedisError as e:
+            print(f"❌ Redis Error: {e}")
+            return None
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")  # Already-encoded JSON
+    return None
+
+def set_cached(key, value, ttl=CACHE_TTL, field=""):
+    if app.state.redis:
+        try:
+            pipe = app.state.redis.pipeline()
+            pipe.hset(key, field, orjson.dumps(value))
+            pipe.expire(key, ttl, nx=True)  # Keep the expiry of a hash that already exists
+            pipe.execute()
+        except redis.RedisError as e:
+            print(f"❌ Redis Error: {e}")
+    return value
+
+def invalidate_cache(user_id, prefixes=CACHE_PREFIXES):
+    if app.state.redis:
+        try:
+            app.state.redis.delete(*(f"{prefix}:{user_id}" for prefix in prefixes))
+        except redis.RedisError as e:
+            print(f"❌ Redis Error: {e}")
+
+def seconds_until_midnight():
+    now = datetime.now()
+    return max(1, int((datetime.combine(now.date() + timedelta(days=1), time.min) - now).total_seconds()))
+
+# ✅ Run at most MAX_CONNECTIONS sync endpoints at once (anyio's default is 40 threads),
+#    so every running handler gets a pooled connection without waiting for one
+@app.on_event("startup")
+async def limit_threadpool():
+    anyio.to_thread.current_default_thread_limiter().total_tokens = MAX_CONNECTIONS
+
+# ✅ Close pooled database connections on shutdown
+@app.on_event("shutdown")
+def close_db_pool():
+    close_pool()
 
 # ✅ Root endpoint for API test
 @app.get("/")
 async def root():
     return {"message": "Solo Leveling API is running!"}
 
+# ✅ Database endpoints are plain `def` so FastAPI runs them in its threadpool
+#    instead of blocking the event loop on psycopg2 calls. Each one checks out a
+#    connection with `with db()` only after a cache miss, so cache hits never touch the pool
+
 # ✅ Habit Adjustment Endpoint (Now prevents duplicate suggestions)
 @app.get("/adjust_habits/{user_id}")
-async def adjust_habits(user_id: int):
-    conn = get_db_connection()
-    if conn:
-        cur = conn.cursor()
-
-        # Get existing pending suggestions
-        cur.execute(
-            "SELECT habit FROM habit_adjustments WHERE user_id = %s AND status = 'pending'", (user_id,)
-        )
-        existing_habits = {row[0] for row in cur.fetchall()}  # Set of pending habit names
-
-        # Fetch latest routine
-        cur.execute("""
-            SELECT wake_up_time, sleep_time, meal_times, energy_level, stress_level, bad_habits, workout
-            FROM daily_routines 
-            WHERE user_id = %s 
-            ORDER BY date DESC 
-            LIMIT 1;
-        """, (user_id,))
-        
-        routine = cur.fetchone()
-        if not routine:
-            return {"message": "❌ No routine data found for this user"}
-
-        wake_up_time, sleep_time, meal_times, energy_level, stress_level, bad_habits, workout = routine
-        adjustments = []
-
-        # 🔹 Wake-Up Time Adjustment
-        if "wake_up_time" not in existing_habits and sleep_time.hour > 1:
-            new_wake_time = f"{max(6, wake_up_time.hour - 1):02d}:{wake_up_time.minute:02d}"
-            adjustments.append({"habit": "wake_up_time", "suggested_change": new_wake_time})
-            cur.execute("""
-                INSERT INTO habit_adjustments (user_id, applied_on, current_value, next_suggested_value, reason, status, habit)
-                VALUES (%s, CURRENT_DATE, %s, %s, %s, 'pending', %s)
-            """, (user_id, wake_up_time, new_wake_time, "Gradual wake-up shift", "wake_up_time"))
-
-        # 🔹 Sleep Time Adjustment
-        if "sleep_time" not in existing_habits and sleep_time.hour > 1:
-            new_sleep_time = f"{max(22, sleep_time.hour - 1):02d}:{sleep_time.minute:02d}"
-            adjustments.append({"habit": "sleep_time", "suggested_change": new_sleep_time})
-            cur.execute("""
-                INSERT INTO habit_adjustments (user_id, applied_on, current_value, next_suggested_value, reason, status, habit)
-                VALUES (%s, CURRENT_DATE, %s, %s, %s, 'pending', %s)
-            """, (user_id, sleep_time, new_sleep_time, "Improve sleep quality", "sleep_time"))
-
-        # 🔹 Meal Timing Adjustment
-        if "meal_times" not in existing_habits and isinstance(meal_times, list):
-            new_meal_times = []
-            for time in meal_times:
-                h, m = map(int, time.split(":"))
-                new_time = f"{max(6, h-1):02d}:{m:02d}"
-                new_meal_times.append(new_time)
-
-                cur.execute("""
-                    INSERT INTO habit_adjustments (user_id, applied_on, current_value, next_suggested_value, reason, status, habit)
-                    VALUES (%s, CURRENT_DATE, %s, %s, %s, 'pending', %s)
-                """, (user_id, time, new_time, "Optimize meal timing", "meal_times"))
-
-            adjustments.append({"habit": "meal_times", "suggested_change": new_meal_times})
-
-        # 🔹 Bad Habits Reduction (Remove one at a time)
-        if "bad_habits" not in existing_habits and isinstance(bad_habits, list) and bad_habits:
-            reduced_bad_habits = bad_habits[:-1]  # Remove only one bad habit
-            adjustments.append({"habit": "bad_habits", "suggested_change": reduced_bad_habits})
-            cur.execute("""
-                INSERT INTO habit_adjustments (user_id, applied_on, current_value, next_suggested_value, reason, status, habit)
-                VALUES (%s, CURRENT_DATE, %s, %s, %s, 'pending', %s)
-            """, (user_id, str(bad_habits), str(reduced_bad_habits), "Reduce negative habits", "bad_habits"))
-
-        conn.commit()
-        cur.close()
-        conn.close()
-
-        return {"adjustments": adjustments}
+def adjust_habits(user_id: int):
+    with db() as conn, conn.cursor() as cur:
+        execute_prepared(cur, "adjust_habits", (user_id,))
+        has_routine, adjustments = cur.fetchone()
+
+    if not has_routine:
+        return {"message": "❌ No routine data found for this user"}
+
+    if adjustments:
+        invalidate_cache(user_id, ("prog",))  # New pending suggestions
+
+    return {"adjustments": adjustments or []}
 
 # ✅ Habit Update Endpoint (User Accepts/Rejects Habit Change)
 class HabitUpdateRequest(BaseModel):
     status: str  # Accepts 'accepted' or 'rejected'
 
 @app.post("/update_habit/{adjustment_id}")
-async def update_habit(adjustment_id: int, request: HabitUpdateRequest):
+def update_habit(adjustment_id: int, request: HabitUpdateRequest):
     if request.status not in ["accepted", "rejected"]:
         raise HTTPException(status_code=400, detail="Invalid status. Must be 'accepted' or 'rejected'.")
 
-    conn = get_db_connection()
-    if conn:
-        cur = conn.cursor()
-
-        # Fetch the habit adjustment
-        cur.execute("""
-            SELECT user_id, habit, current_value, next_suggested_value 
-            FROM habit_adjustments 
-            WHERE adjustment_id = %s
-        """, (adjustment_id,))
-        
-        adjustment = cur.fetchone()
-        if not adjustment:
-            return {"error": "❌ No habit adjustment found for this ID."}
-
-        user_id, habit, previous_value, new_value = adjustment
-
-        # **Move to history if accepted**
-        if request.status == "accepted":
-            cur.execute("""
-                INSERT INTO habit_history (user_id, habit, previous_value, new_value, status)
-                VALUES (%s, %s, %s, %s, 'accepted')
-            """, (user_id, habit, previous_value, new_value))
-
-        elif request.status == "rejected":
-            cur.execute("""
-                INSERT INTO habit_history (user_id, habit, previous_value, new_value, status)
-                VALUES (%s, %s, %s, %s, 'rejected')
-            """, (user_id, habit, previous_value, new_value))
-
-        # **Delete from `habit_adjustments` after moving to history**
-        cur.execute("DELETE FROM habit_adjustments WHERE adjustment_id = %s", (adjustment_id,))
-
-        conn.commit()
-        cur.close()
-        conn.close()
-
-        return {"message": f"✅ Habit adjustment {adjustment_id} marked as {request.status} and moved to history."}
+    with db() as conn, conn.cursor() as cur:
+        execute_prepared(cur, "move_adjustment_to_history", (adjustment_id, request.status))
+        moved = cur.fetchone()
+
+    if not moved:
+        return {"error": "❌ No habit adjustment found for this ID."}
+
+    invalidate_cache(moved[0])
+
+    return {"message": f"✅ Habit adjustment {adjustment_id} marked as {request.status} and moved to history."}
 
 # ✅ Habit Progress Tracking Endpoint
 @app.get("/habit_progress/{user_id}")
-async def habit_progress(user_id: int):
-    conn = get_db_connection()
-    if conn:
-        cur = conn.cursor()
-
-        # Fetch accepted adjustments
-        cur.execute("""
-            SELECT habit, current_value, next_suggested_value, status, applied_on 
-            FROM habit_adjustments 
-            WHERE user_id = %s 
-            ORDER BY applied_on ASC;
-        """, (user_id,))
-        
-        adjustments = cur.fetchall()
-        cur.close()
-        conn.close()
-
-        if not adjustments:
-            return {"message": "No habit progress data found."}
-
-        # Structure the response
-        progress_data = {
-            "accepted": [],
-            "pending": [],
-            "rejected": []
-        }
-
-        for habit, current_value, next_suggested_value, status, applied_on in adjustments:
-            entry = {
-                "habit": habit,
-                "previous_value": current_value,
-                "new_value": next_suggested_value,
-                "date": str(applied_on)
-            }
-
-            if status == "accepted":
-                progress_data["accepted"].append(entry)
-            elif status == "pending":
-                progress_data["pending"].append(entry)
-            else:
-                progress_data["rejected"].append(entry)
-
-        return progress_data
+def habit_progress(user_id: int, limit: int = Query(PAGE_SIZE, ge=1, le=1000), offset: int = Query(0, ge=0)):
+    cache_key, page = f"prog:{user_id}", f"{limit}:{offset}"
+    cached = get_cached(cache_key, page)
+    if cached is not None:
+        return cached
+
+    # Fetch adjustments, already grouped by status
+    with db() as conn, conn.cursor() as cur:
+        execute_prepared(cur, "fetch_progress", (user_id, limit, offset))
+        total, accepted, pending, rejected = cur.fetchone()
+
+    if not total:
+        return set_cached(cache_key, {"message": "No habit progress data found."}, field=page)
+
+    return set_cached(cache_key, {"accepted": accepted, "pending": pending, "rejected": rejected}, field=page)
     
 @app.get("/habit_history/{user_id}")
-async def habit_history(user_id: int):
-    conn = get_db_connection()
-    if conn:
-        cur = conn.cursor()
-
-        # Fetch habit history
-        cur.execute("""
-            SELECT habit, previous_value, new_value, status, date_applied
-            FROM habit_history
-            WHERE user_id = %s
-            ORDER BY date_applied DESC;
-        """, (user_id,))
-        
-        history = cur.fetchall()
-        cur.close()
-        conn.close()
-
-        if not history:
-            return {"message": "No habit history found for this user."}
-
-        # Structure the response
-        history_data = {
-            "accepted": [],
-            "rejected": []
-        }
-
-        for habit, previous_value, new_value, status, date_applied in history:
-            entry = {
-                "habit": habit,
-                "previous_value": previous_value,
-                "new_value": new_value,
-                "date": str(date_applied)
-            }
-
-            if status == "accepted":
-                history_data["accepted"].append(entry)
-            else:
-                history_data["rejected"].append(entry)
-
-        return history_data
+def habit_history(user_id: int, limit: int = Query(PAGE_SIZE, ge=1, le=1000), offset: int = Query(0, ge=0)):
+    cache_key, page = f"hist:{user_id}", f"{limit}:{offset}"
+    cached = get_cached(cache_key, page)
+    if cached is not None:
+        return cached
+
+    # Fetch habit history, already grouped by status
+    with db() as conn, conn.cursor() as cur:
+        execute_prepared(cur, "fetch_history_buckets", (user_id, limit, offset))
+        total, accepted, rejected = cur.fetchone()
+
+    if not total:
+        return set_cached(cache_key, {"message": "No habit history found for this user."}, field=page)
+
+    return set_cached(cache_key, {"accepted": accepted, "rejected": rejected}, field=page)
 
 
 @app.get("/daily_reminders/{user_id}")
-async def daily_reminders(user_id: int):
-    conn = get_db_connection()
-    if conn:
-        cur = conn.cursor()
-
-        # Get reminders for today
-        cur.execute("""
-            SELECT habit, reminder_message, date_applied
-            FROM habit_history
-            WHERE user_id = %s AND status = 'accepted' AND date_applied = CURRENT_DATE
-        """, (user_id,))
-        
+def daily_reminders(user_id: int):
+    cache_key = f"reminders:{user_id}"
+    cached = get_cached(cache_key)
+    if cached is not None:
+        return cached
+
+    # Get reminders for today
+    with db() as conn, conn.cursor() as cur:
+        execute_prepared(cur, "fetch_todays_reminders", (user_id,))
         reminders = cur.fetchall()
-        cur.close()
-        conn.close()
 
-        if not reminders:
-            return {"message": "No habit reminders for today."}
+    # Never past the app's midnight, and no longer than CACHE_TTL: the server's
+    # local date can differ from the database's CURRENT_DATE, and a stale
+    # "no reminders" answer must not outlive an accept until the next day
+    ttl = min(CACHE_TTL, seconds_until_midnight())
 
-        # Structure the response
-        reminder_data = []
-        for habit, reminder_message, date_applied in reminders:
-            reminder_data.append({
-                "habit": habit,
-                "reminder": reminder_message,
-                "date": str(date_applied)
-            })
+    if not reminders:
+        return set_cached(cache_key, {"message": "No habit reminders for today."}, ttl=ttl)
 
-        return {"daily_reminders": reminder_data}
+    # Structure the response
+    reminder_data = [
+        {"habit": habit, "reminder": reminder_message, "date": date_applied}
+        for habit, reminder_message, date_applied in reminders
+    ]
+
+    return set_cached(cache_key, {"daily_reminders": reminder_data}, ttl=ttl)
 
 
 @app.get("/chat_insights/{user_id}")
-async def chat_insights(user_id: int):
-    conn = get_db_connection()
-    if conn:
-        cur = conn.cursor()
-
-        # Fetch habit history
-        cur.execute("""
-            SELECT habit, previous_value, new_value, status, date_applied
-            FROM habit_history
-            WHERE user_id = %s
-            ORDER BY date_applied DESC;
-        """, (user_id,))
-        
-        history = cur.fetchall()
-        cur.close()
-        conn.close()
-
-        if not history:
-            return {"message": "No habit history found for this user."}
-
-        # Generate an AI-style response
-        insights = []
-        for habit, prev, new, status, date in history:
-            if status == "accepted":
-                insights.append(f"✅ You successfully changed {habit} from '{prev}' to '{new}' on {date}. Keep it up!")
-            elif status == "rejected":
-                insights.append(f"❌ You decided not to change {habit} from '{prev}' to '{new}' on {date}. That’s okay! Adjust at your own pace.")
-
-        return {"insights": insights}
+def chat_insights(user_id: int, limit: int = Query(PAGE_SIZE, ge=1, le=1000), offset: int = Query(0, ge=0)):
+    cache_key, page = f"insights:{user_id}", f"{limit}:{offset}"
+    cached = get_cached(cache_key, page)
+    if cached is not None:
+        return cached
+
+    # Generate an AI-style response from habit history
+    with db() as conn, conn.cursor() as cur:
+        execute_prepared(cur, "fetch_insights", (user_id, limit, offset))
+        insights = [row[0] for row in cur.fetchall()]
+
+    if not insights:
+        return set_cached(cache_key, {"message": "No habit history found for this user."}, field=page)
+
+    return set_cached(cache_key, {"insights": insights}, field=page)
 
 
 @app.get("/habit_projections/{user_id}")
-async def habit_projections(user_id: int):
-    conn = get_db_connection()
-    if conn:
-        cur = conn.cursor()
-
-        # Fetch history of accepted habits
-        cur.execute("""
-            SELECT habit, previous_value, new_value, date_applied
-            FROM habit_history
-            WHERE user_id = %s AND status = 'accepted'
-            ORDER BY date_applied ASC;
-        """, (user_id,))
-        
-        history = cur.fetchall()
-        cur.close()
-        conn.close()
-
-        if not history:
-            return {"message": "No habit progress found for this user."}
-
-        projections = {}
-        for habit, prev, new, date in history:
-            if habit not in projections:
-                projections[habit] = {"start": prev, "current": new, "trend": []}
-
-            projections[habit]["trend"].append((date, new))
-            projections[habit]["current"] = new  # Update to latest value
-
-        # AI-generated future projections
-        future_insights = []
-        for habit, data in projections.items():
-            future_prediction = f"If you continue, your {habit} could improve from '{data['start']}' to '{data['current']}' within a few months!"
-            future_insights.append(f"📈 {future_prediction}")
-
-        return {"habit_projections": future_insights}
+def habit_projections(user_id: int):
+    cache_key = f"proj:{user_id}"
+    cached = get_cached(cache_key)
+    if cached is not None:
+        return cached
+
+    # Fetch start and current values of accepted habits
+    with db() as conn, conn.cursor() as cur:
+        execute_prepared(cur, "fetch_projections", (user_id,))
+        projections = cur.fetchall()
+
+    # AI-generated future projections
+    future_insights = [
+        f"📈 If you continue, your {habit} could improve from '{start}' to '{current}' within a few months!"
+        for habit, start, current in projections
+    ]
+
+    if not future_insights:
+        return set_cached(cache_key, {"message": "No habit progress found for this user."})
+
+    return set_cached(cache_key, {"habit_projections": future_insights})
+
 
+if __name__ == "__main__":
+    import uvicorn
 
+    # uvloop + httptools: faster event loop and HTTP parser than uvicorn's pure-Python defaults
+    uvicorn.run("api:app", loop="uvloop", http="httptools", workers=os.cpu_count())
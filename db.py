@@ -1,52 +1,149 @@
 import os
+import threading
+from contextlib import contextmanager
 import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
 from dotenv import load_dotenv
+from typing import Final
 
 # Load environment variables from .env file
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# PREPAREd statements live in a server session, so they must be turned off
+# (DATABASE_PREPARE=0) behind PgBouncer in transaction pooling mode
+USE_PREPARED_STATEMENTS = os.getenv("DATABASE_PREPARE", "1") != "0"
+
+# Queries are kept as bytes so execute() skips the str -> bytes encode on every call
+# (the database and client encoding are UTF-8)
+SQL_INSERT_ROUTINE: Final = b"""
+    INSERT INTO daily_routines (user_id, date, wake_up_time, sleep_time, meal_times, workout, bad_habits, energy_level, stress_level)
+    VALUES (%s, %s, %s, %s, %s::time[], %s, %s, %s, %s)
+    RETURNING routine_id
+"""
+
+SQL_FETCH_ROUTINES: Final = b"""
+    SELECT routine_id, date, wake_up_time, sleep_time, meal_times, workout, bad_habits, energy_level, stress_level
+    FROM daily_routines
+    WHERE user_id = %s
+    ORDER BY date DESC, routine_id DESC
+    LIMIT %s
+"""
+
+# Statements PREPAREd server-side on every pooled connection, keyed by name
+PREPARED_STATEMENTS = {}
+
+class PreparedConnection(psycopg2.extensions.connection):
+    """Connection that tracks which registered statements it has already PREPAREd."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+MAX_CONNECTIONS = 20
+POOL_TIMEOUT = 30  # Seconds to wait for a free pooled connection before giving up
+
+# Process-wide pool so requests reuse connections instead of reconnecting each time.
+# Created on first checkout, so a process that only imports this module (such as the
+# `python api.py` supervisor) holds no connections
+POOL = None
+POOL_LOCK = threading.Lock()
+# ThreadedConnectionPool raises PoolError once maxconn connections are out;
+# callers wait on this instead until one is returned
+POOL_SLOTS = threading.BoundedSemaphore(MAX_CONNECTIONS)
+
+class DatabaseUnavailable(Exception):
+    """Raised when no database connection can be checked out."""
+
+def prepare_statement(name, query):
+    """Registers a query (with %s placeholders) to be PREPAREd on pooled connections."""
+    param_count = query.replace("%%", "").count("%s")
+    placeholders = tuple(f"${i}" for i in range(1, param_count + 1))
+    execute = f"EXECUTE {name}({', '.join(['%s'] * param_count)})" if param_count else f"EXECUTE {name}"
+    PREPARED_STATEMENTS[name] = {
+        "query": query.encode(),
+        "prepare": f"PREPARE {name} AS {query % placeholders}".encode(),
+        "execute": execute.encode(),
+    }
+
+def execute_prepared(cur, name, params=None):
+    """Runs a statement registered with prepare_statement(), PREPAREing it on first use per connection."""
+    if USE_PREPARED_STATEMENTS:
+        # Prepared one at a time, so a statement that fails to PREPARE only breaks
+        # the endpoints that run it. A PREPARE outlives a rolled-back transaction.
+        if name not in cur.connection.prepared:
+            cur.execute(PREPARED_STATEMENTS[name]["prepare"])
+            cur.connection.prepared.add(name)
+        cur.execute(PREPARED_STATEMENTS[name]["execute"], params)
+    else:
+        cur.execute(PREPARED_STATEMENTS[name]["query"], params)
+
+def get_pool():
+    """Returns the connection pool, creating it on first use."""
+    global POOL
+    with POOL_LOCK:
+        if POOL is None:
+            POOL = psycopg2.pool.ThreadedConnectionPool(
+                minconn=5, maxconn=MAX_CONNECTIONS, dsn=DATABASE_URL, connection_factory=PreparedConnection
+            )
+        return POOL
+
+def close_pool():
+    """Closes every pooled connection; the next checkout opens a fresh pool."""
+    global POOL
+    with POOL_LOCK:
+        if POOL is not None:
+            POOL.closeall()
+            POOL = None
+
 def get_db_connection():
-    """Establishes a connection to PostgreSQL."""
+    """Checks out a connection from the PostgreSQL pool, waiting up to POOL_TIMEOUT for a free one."""
+    if not POOL_SLOTS.acquire(timeout=POOL_TIMEOUT):
+        raise DatabaseUnavailable(f"No database connection free after {POOL_TIMEOUT}s")
     try:
-        conn = psycopg2.connect(DATABASE_URL)
-        return conn
+        conn = get_pool().getconn()
     except Exception as e:
+        POOL_SLOTS.release()
         print(f"❌ Error connecting to PostgreSQL: {e}")
-        return None
+        raise DatabaseUnavailable(str(e)) from e
+    return conn
+
+def release_db_connection(conn):
+    """Returns a connection to the pool."""
+    try:
+        POOL.putconn(conn)
+    finally:
+        POOL_SLOTS.release()
+
+@contextmanager
+def db():
+    """Checks out a pooled connection for one transaction (committed on success, rolled back on error)."""
+    conn = get_db_connection()
+    try:
+        with conn:
+            yield conn
+    finally:
+        release_db_connection(conn)
 
 def insert_routine(user_id, date, wake_up_time, sleep_time, meal_times, workout, bad_habits, energy_level, stress_level):
     """Inserts a daily routine into the database."""
-    conn = get_db_connection()
-    if conn:
-        cur = conn.cursor()
-        query = """
-        INSERT INTO daily_routines (user_id, date, wake_up_time, sleep_time, meal_times, workout, bad_habits, energy_level, stress_level)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        RETURNING routine_id;
-        """
-        cur.execute(query, (user_id, date, wake_up_time, sleep_time, meal_times, workout, bad_habits, energy_level, stress_level))
+    with db() as conn, conn.cursor() as cur:
+        cur.execute(SQL_INSERT_ROUTINE, (user_id, date, wake_up_time, sleep_time, meal_times, workout, bad_habits, energy_level, stress_level))
         routine_id = cur.fetchone()[0]
-        conn.commit()
-        cur.close()
-        conn.close()
-        print(f"✅ Routine added with ID {routine_id}")
+    print(f"✅ Routine added with ID {routine_id}")
 
-def fetch_routines(user_id):
-    """Fetches all routines for a user."""
-    conn = get_db_connection()
-    if conn:
-        cur = conn.cursor()
-        query = "SELECT * FROM daily_routines WHERE user_id = %s ORDER BY date DESC;"
-        cur.execute(query, (user_id,))
-        rows = cur.fetchall()
+def fetch_routines(user_id, limit=None):
+    """Fetches a user's routines, newest first (all of them unless limit is given)."""
+    # Server-side cursor: rows stream from PostgreSQL in itersize batches instead of all at once
+    with db() as conn, conn.cursor(name="fetch_routines") as cur:
+        cur.itersize = 500
+        cur.execute(SQL_FETCH_ROUTINES, (user_id, limit))  # LIMIT NULL returns every row
         print("📆 User's Daily Routines:")
-        for row in rows:
+        for row in cur:
             print(row)
-        cur.close()
-        conn.close()
-        print("🔌 Connection closed")
+    print("🔌 Connection released")
 
 if __name__ == "__main__":
     # Test inserting a routine
@@ -0,0 +1,18 @@
+-- At most one pending suggestion per user and habit.
+-- adjust_habits relies on this index for INSERT ... ON CONFLICT DO NOTHING.
+
+-- Meal timing used to be suggested as one row per meal; it is now a single row,
+-- regenerated on the next /adjust_habits call.
+DELETE FROM habit_adjustments
+WHERE habit = 'meal_times' AND status = 'pending';
+
+-- Keep only the oldest pending suggestion for any other duplicated habit
+DELETE FROM habit_adjustments a
+USING habit_adjustments b
+WHERE a.status = 'pending' AND b.status = 'pending'
+  AND a.user_id = b.user_id AND a.habit = b.habit
+  AND a.adjustment_id > b.adjustment_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS habit_adj_pending_unique
+    ON habit_adjustments (user_id, habit)
+    WHERE status = 'pending';
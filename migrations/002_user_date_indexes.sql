@@ -0,0 +1,37 @@
+-- Composite indexes for the "WHERE user_id = ? ORDER BY <date>, <id>" reads in api.py.
+-- The trailing id matches each query's unique tiebreaker, so LIMIT/OFFSET pages
+-- walk the index in order.
+-- INCLUDE (PostgreSQL 11+) carries the projected columns so the habit_* reads
+-- can use index-only scans instead of Seq Scan + Sort.
+
+-- habit_history's primary key is not part of this repo, so give it a row id the
+-- tiebreakers can rely on. A no-op where history_id already exists; otherwise the
+-- table is rewritten once to backfill it.
+ALTER TABLE habit_history
+    ADD COLUMN IF NOT EXISTS history_id BIGINT GENERATED BY DEFAULT AS IDENTITY;
+
+-- adjust_habits, fetch_routines
+CREATE INDEX IF NOT EXISTS daily_routines_user_date
+    ON daily_routines (user_id, date DESC, routine_id DESC);
+
+-- habit_progress
+CREATE INDEX IF NOT EXISTS habit_adjustments_user_applied
+    ON habit_adjustments (user_id, applied_on, adjustment_id)
+    INCLUDE (habit, current_value, next_suggested_value, status);
+
+-- habit_history, daily_reminders, chat_insights, habit_projections
+CREATE INDEX IF NOT EXISTS habit_history_user_date
+    ON habit_history (user_id, date_applied DESC, history_id DESC)
+    INCLUDE (habit, previous_value, new_value, status);
+
+-- Refresh planner statistics so the new indexes are picked up straight away.
+-- (Index-only scans also rely on the visibility map, which autovacuum maintains;
+-- run VACUUM on these tables outside a transaction to populate it immediately.)
+ANALYZE daily_routines;
+ANALYZE habit_adjustments;
+ANALYZE habit_history;
+
+-- Check each plan now reads the index, e.g.:
+--   EXPLAIN (ANALYZE, BUFFERS)
+--   SELECT habit, previous_value, new_value, status, date_applied
+--   FROM habit_history WHERE user_id = 1 ORDER BY date_applied DESC;
@@ -0,0 +1,5 @@
+-- Store meal times as TIME[] instead of 'HH:MM' text so they are parsed once,
+-- on write, rather than with string functions on every /adjust_habits call.
+-- The USING clause converts existing rows in place.
+ALTER TABLE daily_routines
+    ALTER COLUMN meal_times TYPE time[] USING meal_times::time[];
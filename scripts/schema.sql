@@ -0,0 +1,39 @@
+-- Baseline tables the API was written against, before migrations/ is applied.
+-- Reconstructed from the queries in api.py and db.py (the original DDL is not in
+-- this repo), with only the columns the original code used: habit_history has no
+-- id here, so migration 002 has to add history_id. scripts/check_statements.py
+-- builds on it.
+
+CREATE TABLE daily_routines (
+    routine_id SERIAL PRIMARY KEY,
+    user_id INT NOT NULL,
+    date DATE NOT NULL,
+    wake_up_time TIME,
+    sleep_time TIME,
+    meal_times TEXT[],
+    workout TEXT,
+    bad_habits TEXT[],
+    energy_level INT,
+    stress_level INT
+);
+
+CREATE TABLE habit_adjustments (
+    adjustment_id SERIAL PRIMARY KEY,
+    user_id INT NOT NULL,
+    habit TEXT NOT NULL,
+    current_value TEXT,
+    next_suggested_value TEXT,
+    reason TEXT,
+    status TEXT DEFAULT 'pending',
+    applied_on DATE DEFAULT CURRENT_DATE
+);
+
+CREATE TABLE habit_history (
+    user_id INT NOT NULL,
+    habit TEXT NOT NULL,
+    previous_value TEXT,
+    new_value TEXT,
+    status TEXT,
+    date_applied DATE DEFAULT CURRENT_DATE,
+    reminder_message TEXT
+);